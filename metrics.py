@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the NumPy implementation
+    njit = None
+
+
+def _compute_stats_numpy(a):
+    # Cumulative PNL and drawdown from the running high-water mark
+    cum_pnl = np.cumsum(a)
+    drawdown = cum_pnl - np.maximum.accumulate(cum_pnl)
+
+    pos = a > 0
+    neg = a < 0
+    win_values = a[pos]
+    loss_values = a[neg]
+    win_count = win_values.size
+    loss_count = loss_values.size
+
+    # Streaks: run-length encode the sign series and take the longest run per sign.
+    # The signs are built from the masks as 1-byte ints, with no float64 temporary
+    signs = pos.view(np.int8) - neg.view(np.int8)
+    run_starts = np.r_[True, signs[1:] != signs[:-1]][:signs.size]
+    run_lengths = np.bincount(np.cumsum(run_starts))[1:]
+    run_signs = signs[run_starts]
+
+    return (
+        a.sum(),
+        win_count,
+        loss_count,
+        win_values.sum(),
+        loss_values.sum(),
+        win_values.max() if win_count else 0.0,
+        loss_values.min() if loss_count else 0.0,
+        drawdown.min() if drawdown.size else 0.0,
+        drawdown[-1] if drawdown.size else 0.0,
+        run_lengths[run_signs == 1].max(initial=0),
+        run_lengths[run_signs == -1].max(initial=0),
+        cum_pnl,
+        drawdown,
+    )
+
+
+def _compute_stats_loop(a):
+    # Single pass over the array: totals, extremes, drawdown and streaks together
+    n = a.shape[0]
+    cum_pnl = np.empty(n)
+    drawdown = np.empty(n)
+    total = win_sum = loss_sum = 0.0
+    win_max = loss_min = max_dd = 0.0
+    high_water_mark = -np.inf
+    win_count = loss_count = 0
+    win_streak = loss_streak = max_win_streak = max_loss_streak = 0
+    for i in range(n):
+        val = a[i]
+        total += val
+        cum_pnl[i] = total
+        if total > high_water_mark:
+            high_water_mark = total
+        dd = total - high_water_mark
+        drawdown[i] = dd
+        if dd < max_dd:
+            max_dd = dd
+        if val > 0:
+            win_count += 1
+            win_sum += val
+            if val > win_max:
+                win_max = val
+            win_streak += 1
+            loss_streak = 0
+        elif val < 0:
+            loss_count += 1
+            loss_sum += val
+            if val < loss_min:
+                loss_min = val
+            loss_streak += 1
+            win_streak = 0
+        else:
+            win_streak = loss_streak = 0
+        if win_streak > max_win_streak:
+            max_win_streak = win_streak
+        if loss_streak > max_loss_streak:
+            max_loss_streak = loss_streak
+    cur_dd = drawdown[n - 1] if n > 0 else 0.0
+
+    return (
+        total,
+        win_count,
+        loss_count,
+        win_sum,
+        loss_sum,
+        win_max,
+        loss_min,
+        max_dd,
+        cur_dd,
+        max_win_streak,
+        max_loss_streak,
+        cum_pnl,
+        drawdown,
+    )
+
+
+# compute_stats(a) -> (total, win_count, loss_count, win_sum, loss_sum, win_max,
+#                      loss_min, max_dd, cur_dd, max_win_streak, max_loss_streak,
+#                      cum_pnl, drawdown)
+# numba is an optional install (see requirements.txt). The vectorized NumPy
+# version is the default; with numba the single-pass loop is compiled instead.
+# tests/test_metrics.py keeps both equivalent to the original metric code.
+if njit is not None:
+    compute_stats = njit(cache=True)(_compute_stats_loop)
+else:
+    compute_stats = _compute_stats_numpy
+
+
+def detect_client_columns(rows):
+    # Detect clients from row 0 (column headers) and map each one to its
+    # Daily PNL column from row 1
+    header_row, metric_row = pd.DataFrame(rows[:2]).to_numpy()
+    names = pd.Series(header_row, dtype=object)
+    # Same isinstance check as before; the header is one row, so the per-cell
+    # call is negligible next to the vectorized isin
+    is_client = names.map(lambda x: isinstance(x, str)) & ~names.isin(['Date', 'Day', 'Month'])
+    clients = np.sort(names[is_client].unique()).tolist()
+    client_columns = {}
+    for i in np.flatnonzero(is_client.to_numpy() & (metric_row == "Daily PNL")):
+        client_columns.setdefault(header_row[i], int(i))
+    return clients, client_columns
+
+
+def load_and_parse(date_column, pnl_column):
+    # Pair the Date column with a client's Daily PNL column, skipping the two
+    # header rows; the API trims trailing empty cells, so pad both columns to
+    # the same length before pairing them row by row
+    n = max(len(date_column), len(pnl_column))
+    dates = pd.Series(list(date_column) + [None] * (n - len(date_column)), dtype=object)[2:]
+    values = pd.Series(list(pnl_column) + [None] * (n - len(pnl_column)), dtype=object)[2:]
+    # Sheets serial dates count days from 1899-12-30; cells stored as text are
+    # not serials, so parse those as date strings instead of dropping them
+    serial = pd.to_numeric(dates, errors='coerce')
+    parsed_dates = pd.to_datetime(serial, unit='D', origin='1899-12-30').fillna(
+        pd.to_datetime(dates.where(serial.isna()), errors='coerce')
+    )
+    data = pd.DataFrame({
+        'Date': parsed_dates,
+        'Daily PNL': pd.to_numeric(values, errors='coerce'),
+    })
+    data = data.dropna()
+    return data.sort_values('Date').reset_index(drop=True)
+
+
+def compute_metrics(pnl):
+    # Summary metrics plus the cumulative PNL and drawdown series for the charts
+    (total_pnl, win_count, loss_count, win_sum, loss_sum, win_max, loss_min,
+     max_dd, cur_dd, max_win_streak, max_loss_streak, cum_pnl, drawdown) = compute_stats(pnl)
+    total_trades = pnl.size
+
+    metrics = {
+        "Total PNL": float(total_pnl),
+        "Win Days": int(win_count),
+        "Loss Days": int(loss_count),
+        "Win Ratio (%)": win_count / total_trades * 100 if total_trades else 0,
+        "Loss Ratio (%)": loss_count / total_trades * 100 if total_trades else 0,
+        "Avg Profit on Win Days": win_sum / win_count if win_count else 0,
+        "Avg Loss on Loss Days": loss_sum / loss_count if loss_count else 0,
+        "Total Profit on Win Days": float(win_sum),
+        "Total Loss on Loss Days": float(loss_sum),
+        "Max Profit": float(win_max),
+        "Max Loss": float(loss_min),
+        "Max Drawdown": float(max_dd),
+        "Current Drawdown": float(cur_dd),
+        "Max Winning Streak (Days)": int(max_win_streak),
+        "Max Losing Streak (Days)": int(max_loss_streak),
+    }
+
+    metrics["Risk Reward"] = abs(metrics["Avg Profit on Win Days"] / metrics["Avg Loss on Loss Days"] if metrics["Avg Loss on Loss Days"] != 0 else 0)
+    metrics["Expectancy"] = (
+        (metrics["Win Ratio (%)"] / 100) * metrics["Avg Profit on Win Days"]
+        + (metrics["Loss Ratio (%)"] / 100) * metrics["Avg Loss on Loss Days"]
+    )
+    return metrics, cum_pnl, drawdown
+
+
+def monthwise_pnl(data):
+    # Group on integer months since the epoch, then format the labels once
+    month_keys = data['Date'].to_numpy().astype('datetime64[M]').astype(np.int64)
+    month_totals = data['Daily PNL'].groupby(month_keys).sum()
+    return pd.DataFrame({
+        'Month': month_totals.index.to_numpy().astype('datetime64[M]').astype(str),
+        'Daily PNL': month_totals.to_numpy(),
+    })
@@ -1,9 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 
 st.set_page_config(page_title="Client PnL Dashboard", layout="wide")
 st.title("📊 Client PnL Dashboard")
@@ -11,150 +8,159 @@ st.title("📊 Client PnL Dashboard")
 # Google Sheets settings
 SHEET_ID = "1eR0N0Vnq-FD5fuvikGDtK_ODXQCHv2i18y1EgtbIQKw"
 SHEET_NAME = "Clients Daily PNL"  # Change if needed
+SHEET_RANGE = "'" + SHEET_NAME.replace("'", "''") + "'"  # quoted for A1 ranges
 
 # Authenticate with Service Account in Streamlit secrets
 if "service_account" not in st.secrets:
     st.error("Service account not found in Streamlit secrets. Please set this in your app's Settings > Secrets.")
     st.stop()
 
-creds = service_account.Credentials.from_service_account_info(
-    dict(st.secrets["service_account"]),
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-
-from googleapiclient.discovery import build
-
-drive_service = build('drive', 'v3', credentials=creds)
-results = drive_service.files().list(
-    q="mimeType='application/vnd.google-apps.spreadsheet'",
-    pageSize=100,
-    fields="files(id, name)").execute()
-items = results.get('files', [])
-if not items:
-    st.write('No Google Sheets found for this account.')
-else:
-    st.write('Google Sheets visible to this service account:')
-    for item in items:
-        st.write(f"{item['name']}: {item['id']}")
-
-# Connect to the Sheets API
-service = build("sheets", "v4", credentials=creds)
-sheet = service.spreadsheets()
-
-# List all sheet names in the spreadsheet for debugging
-meta = sheet.get(spreadsheetId=SHEET_ID).execute()
-sheet_titles = [s['properties']['title'] for s in meta['sheets']]
-st.write("✅ Sheets available in this file:", sheet_titles)
-
-# Read the full sheet data as a list of lists
-result = sheet.values().get(
-    spreadsheetId=SHEET_ID,
-    range=SHEET_NAME
-).execute()
-rows = result.get("values", [])
-
-if not rows or len(rows) < 2:
+# Imported past the secrets check so the error page does not load numba
+# when it is installed
+from metrics import compute_metrics, detect_client_columns, load_and_parse, monthwise_pnl  # noqa: E402
+
+
+@st.cache_resource
+def get_credentials():
+    from google.oauth2 import service_account
+
+    return service_account.Credentials.from_service_account_info(
+        dict(st.secrets["service_account"]),
+        scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
+    )
+
+
+def authorized_http():
+    # A fresh HTTP client for each request: the cached services below are shared
+    # by every session's script thread, and httplib2.Http is not thread-safe
+    import google_auth_httplib2
+    import httplib2
+
+    return google_auth_httplib2.AuthorizedHttp(get_credentials(), http=httplib2.Http())
+
+
+# Build the Drive and Sheets API clients once per process; requests pass their
+# own http. The discovery client is imported here so a missing-secrets page
+# never pays for it
+@st.cache_resource
+def get_drive_service():
+    from googleapiclient.discovery import build
+
+    return build('drive', 'v3', credentials=get_credentials(), cache_discovery=False)
+
+
+@st.cache_resource
+def get_sheet_service():
+    from googleapiclient.discovery import build
+
+    return build("sheets", "v4", credentials=get_credentials(), cache_discovery=False).spreadsheets()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_spreadsheets():
+    results = get_drive_service().files().list(
+        q="mimeType='application/vnd.google-apps.spreadsheet'",
+        pageSize=100,
+        fields="files(id, name)").execute(http=authorized_http())
+    return results.get('files', [])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_sheet_titles(sheet_id):
+    meta = get_sheet_service().get(spreadsheetId=sheet_id).execute(http=authorized_http())
+    return [s['properties']['title'] for s in meta['sheets']]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_rows(sheet_id, range_name):
+    # Read the range as a list of row lists of formatted strings, so header
+    # cells such as numeric client codes match the selectbox labels
+    result = get_sheet_service().values().get(
+        spreadsheetId=sheet_id,
+        range=range_name,
+        valueRenderOption="FORMATTED_VALUE"
+    ).execute(http=authorized_http())
+    return result.get("values", [])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_columns(sheet_id, ranges):
+    # Fetch only the given column ranges in one request, one list of cells per
+    # column; numbers come back as JSON numbers and dates as serial day counts,
+    # so no string parsing is needed
+    result = get_sheet_service().values().batchGet(
+        spreadsheetId=sheet_id,
+        ranges=list(ranges),
+        majorDimension="COLUMNS",
+        valueRenderOption="UNFORMATTED_VALUE",
+        dateTimeRenderOption="SERIAL_NUMBER"
+    ).execute(http=authorized_http())
+    return [value_range.get("values", [[]])[0] for value_range in result.get("valueRanges", [])]
+
+
+def column_letter(index):
+    # Zero-based column index to A1 letters: 0 -> A, 25 -> Z, 26 -> AA
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def build_client_index(sheet_id, range_name):
+    # Client list and {client: Daily PNL column}, rebuilt once per sheet refresh
+    return detect_client_columns(load_rows(sheet_id, range_name))
+
+
+# Debug listing of visible spreadsheets and sheet tabs, only on request
+if st.sidebar.checkbox("Debug: list sheets"):
+    items = list_spreadsheets()
+    if not items:
+        st.write('No Google Sheets found for this account.')
+    else:
+        st.write('Google Sheets visible to this service account:')
+        for item in items:
+            st.write(f"{item['name']}: {item['id']}")
+
+    # List all sheet names in the spreadsheet for debugging
+    sheet_titles = load_sheet_titles(SHEET_ID)
+    st.write("✅ Sheets available in this file:", sheet_titles)
+
+# Only the two header rows are needed to find the clients and their columns
+HEADER_RANGE = f"{SHEET_RANGE}!1:2"
+header_rows = load_rows(SHEET_ID, HEADER_RANGE)
+
+if not header_rows or len(header_rows) < 2:
     st.error("No data found in the Google Sheet.")
     st.stop()
 
-# Convert to DataFrame
-df_raw = pd.DataFrame(rows)
-
-# Detect clients from row 0 (column headers)
-client_row = df_raw.iloc[0]
-clients = sorted(set(x for x in client_row if isinstance(x, str) and x not in ['Date', 'Day', 'Month']))
+clients, client_columns = build_client_index(SHEET_ID, HEADER_RANGE)
 
 selected_client = st.selectbox("Select Client", clients)
 
 # Identify the column index for this client's Daily PNL
-client_col_index = None
-for i, val in enumerate(client_row):
-    if val == selected_client and df_raw.iloc[1, i] == "Daily PNL":
-        client_col_index = i
-        break
+client_col_index = client_columns.get(selected_client)
 
 if client_col_index is None:
     st.warning("Client's Daily PNL column not found.")
 else:
-    # Extract Date + Daily PNL
-    data = df_raw[[0, client_col_index]].copy()
-    data.columns = ['Date', 'Daily PNL']
-    data = data[2:]  # skip headers
-    data['Date'] = pd.to_datetime(data['Date'], errors='coerce')
-    data['Daily PNL'] = pd.to_numeric(data['Daily PNL'], errors='coerce')
-    data = data.dropna()
-    data = data.sort_values('Date').reset_index(drop=True)
-
-    # Compute metrics
-    pnl = data['Daily PNL']
-    cum_pnl = pnl.cumsum()
-    high_water_mark = cum_pnl.cummax()
-    drawdown = cum_pnl - high_water_mark
-
-    win_days = pnl[pnl > 0]
-    loss_days = pnl[pnl < 0]
-    total_trades = len(pnl)
-
-    metrics = {
-        "Total PNL": pnl.sum(),
-        "Win Days": len(win_days),
-        "Loss Days": len(loss_days),
-        "Win Ratio (%)": len(win_days) / total_trades * 100 if total_trades else 0,
-        "Loss Ratio (%)": len(loss_days) / total_trades * 100 if total_trades else 0,
-        "Avg Profit on Win Days": win_days.mean() if not win_days.empty else 0,
-        "Avg Loss on Loss Days": loss_days.mean() if not loss_days.empty else 0,
-        "Total Profit on Win Days": win_days.sum(),
-        "Total Loss on Loss Days": loss_days.sum(),
-        "Max Profit": win_days.max() if not win_days.empty else 0,
-        "Max Loss": loss_days.min() if not loss_days.empty else 0,
-        "Max Drawdown": drawdown.min(),
-        "Current Drawdown": drawdown.iloc[-1] if not drawdown.empty else 0,
-    }
-
-    # Streaks
-    streaks = np.sign(pnl)
-    win_streak = loss_streak = max_win_streak = max_loss_streak = 0
-    for val in streaks:
-        if val > 0:
-            win_streak += 1
-            loss_streak = 0
-        elif val < 0:
-            loss_streak += 1
-            win_streak = 0
-        else:
-            win_streak = loss_streak = 0
-        max_win_streak = max(max_win_streak, win_streak)
-        max_loss_streak = max(max_loss_streak, loss_streak)
-
-    metrics["Max Winning Streak (Days)"] = max_win_streak
-    metrics["Max Losing Streak (Days)"] = max_loss_streak
-    metrics["Risk Reward"] = abs(metrics["Avg Profit on Win Days"] / metrics["Avg Loss on Loss Days"] if metrics["Avg Loss on Loss Days"] != 0 else 0)
-    metrics["Expectancy"] = (
-        (metrics["Win Ratio (%)"] / 100) * metrics["Avg Profit on Win Days"]
-        + (metrics["Loss Ratio (%)"] / 100) * metrics["Avg Loss on Loss Days"]
-    )
+    # Fetch just the Date column and this client's column
+    col = column_letter(client_col_index)
+    date_column, pnl_column = load_columns(SHEET_ID, (f"{SHEET_RANGE}!A:A", f"{SHEET_RANGE}!{col}:{col}"))
+    data = load_and_parse(date_column, pnl_column)
+    metrics, cum_pnl, drawdown = compute_metrics(data['Daily PNL'].to_numpy(dtype=np.float64))
 
     st.subheader("📋 Summary Metrics")
     st.dataframe(pd.DataFrame(metrics.items(), columns=["Metric", "Value"]))
 
     st.subheader("📈 Cumulative PNL Chart")
-    fig1, ax1 = plt.subplots()
-    ax1.plot(data['Date'], cum_pnl, label="Cumulative PNL")
-    ax1.set_ylabel("PNL")
-    ax1.set_xlabel("Date")
-    ax1.grid(True)
-    st.pyplot(fig1)
+    st.line_chart(pd.DataFrame({"Cumulative PNL": cum_pnl}, index=data['Date']))
 
     st.subheader("📉 Drawdown Chart")
-    fig2, ax2 = plt.subplots()
-    ax2.plot(data['Date'], drawdown, label="Drawdown", color='red')
-    ax2.set_ylabel("Drawdown")
-    ax2.set_xlabel("Date")
-    ax2.grid(True)
-    st.pyplot(fig2)
+    st.line_chart(pd.DataFrame({"Drawdown": drawdown}, index=data['Date']), color="#ff0000")
 
     st.subheader("📆 Month-wise PNL")
-    data['Month'] = data['Date'].dt.to_period('M')
-    monthwise = data.groupby('Month')['Daily PNL'].sum().reset_index()
-    monthwise['Month'] = monthwise['Month'].astype(str)
+    monthwise = monthwise_pnl(data)
     st.dataframe(monthwise)
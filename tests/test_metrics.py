@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import metrics
+
+
+def reference_stats(a):
+    # The original Series-based metric code and streak loop from streamlit_app.py
+    pnl = pd.Series(a, dtype=np.float64)
+    cum_pnl = pnl.cumsum()
+    drawdown = cum_pnl - cum_pnl.cummax()
+    win_days = pnl[pnl > 0]
+    loss_days = pnl[pnl < 0]
+
+    win_streak = loss_streak = max_win_streak = max_loss_streak = 0
+    for val in np.sign(pnl):
+        if val > 0:
+            win_streak += 1
+            loss_streak = 0
+        elif val < 0:
+            loss_streak += 1
+            win_streak = 0
+        else:
+            win_streak = loss_streak = 0
+        max_win_streak = max(max_win_streak, win_streak)
+        max_loss_streak = max(max_loss_streak, loss_streak)
+
+    return (
+        pnl.sum(),
+        len(win_days),
+        len(loss_days),
+        win_days.sum(),
+        loss_days.sum(),
+        win_days.max() if not win_days.empty else 0,
+        loss_days.min() if not loss_days.empty else 0,
+        drawdown.min() if not drawdown.empty else 0,
+        drawdown.iloc[-1] if not drawdown.empty else 0,
+        max_win_streak,
+        max_loss_streak,
+        cum_pnl.to_numpy(),
+        drawdown.to_numpy(),
+    )
+
+
+def implementations():
+    impls = [metrics._compute_stats_numpy, metrics._compute_stats_loop]
+    if metrics.njit is not None:
+        impls.append(metrics.compute_stats)
+    return impls
+
+
+rng = np.random.default_rng(0)
+
+CASES = {
+    "random": rng.choice([-2.5, -1.0, 0.0, 1.5, 3.0], size=500),
+    "random_normal": rng.normal(size=200),
+    "empty": np.array([], dtype=np.float64),
+    "single": np.array([4.0]),
+    "all_flat": np.zeros(10),
+    "all_negative": -rng.random(20) - 0.1,
+    "all_positive": rng.random(20) + 0.1,
+}
+
+
+@pytest.mark.parametrize("impl", implementations(), ids=lambda f: f.__name__)
+@pytest.mark.parametrize("name", CASES)
+def test_compute_stats_matches_reference(impl, name):
+    a = CASES[name]
+    expected = reference_stats(a)
+    result = impl(a)
+
+    assert len(result) == len(expected)
+    for got, want in zip(result, expected):
+        np.testing.assert_allclose(got, want)
+
+
+def test_load_and_parse_mixes_serial_and_text_dates():
+    # 45000 is 2023-03-15 as a Sheets serial; text dates parse like the baseline
+    data = metrics.load_and_parse(
+        ["Date", "", 45000, "2023-03-16", 45002.5],
+        ["A", "Daily PNL", 1, 2, "3"],
+    )
+
+    assert list(data.columns) == ['Date', 'Daily PNL']
+    assert list(data['Date']) == [
+        pd.Timestamp("2023-03-15"),
+        pd.Timestamp("2023-03-16"),
+        pd.Timestamp("2023-03-17 12:00"),
+    ]
+    assert list(data['Daily PNL']) == [1, 2, 3]
+
+
+def test_load_and_parse_drops_blank_and_total_rows():
+    data = metrics.load_and_parse(
+        ["Date", "", 45001, None, "Total", 45000],
+        ["A", "Daily PNL", 1, 2, 3, -4],
+    )
+
+    # Remaining rows come back sorted by date
+    assert list(data['Date']) == [pd.Timestamp("2023-03-15"), pd.Timestamp("2023-03-16")]
+    assert list(data['Daily PNL']) == [-4, 1]
+
+
+def test_load_and_parse_pads_a_short_pnl_column():
+    # Trailing blank PNL cells are trimmed by the API, leaving a shorter column
+    data = metrics.load_and_parse(
+        ["Date", "", 45000, 45001, 45002],
+        ["A", "Daily PNL", 5],
+    )
+
+    assert list(data['Date']) == [pd.Timestamp("2023-03-15")]
+    assert list(data['Daily PNL']) == [5]
+
+
+def test_load_and_parse_without_data_rows():
+    data = metrics.load_and_parse(["Date", ""], [])
+
+    assert data.empty
+    assert list(data.columns) == ['Date', 'Daily PNL']
+
+
+def test_detect_client_columns_skips_labels_and_non_strings():
+    clients, client_columns = metrics.detect_client_columns([
+        ["Date", "Day", "Zed", "Amy", 3, "Month"],
+        ["", "", "Daily PNL", "Daily PNL", "Daily PNL", ""],
+    ])
+
+    assert clients == ["Amy", "Zed"]
+    assert client_columns == {"Zed": 2, "Amy": 3}
+
+
+def test_detect_client_columns_without_string_headers():
+    assert metrics.detect_client_columns([[45292.0, 45293.0], ["Daily PNL", "Daily PNL"]]) == ([], {})
+
+
+def test_detect_client_columns_keeps_first_daily_pnl_column():
+    clients, client_columns = metrics.detect_client_columns([
+        ["Date", "Amy", "Amy", "Amy"],
+        ["", "Capital", "Daily PNL", "Daily PNL"],
+    ])
+
+    assert clients == ["Amy"]
+    assert client_columns == {"Amy": 2}
+
+
+def test_monthwise_pnl_labels_months_like_to_period():
+    data = pd.DataFrame({
+        'Date': pd.to_datetime(["2023-01-31", "2023-01-02", "2023-02-01", "2023-12-15"]),
+        'Daily PNL': [1.0, 2.5, -4.0, 3.0],
+    })
+
+    monthwise = metrics.monthwise_pnl(data)
+
+    # Same columns and YYYY-MM labels as the baseline to_period('M') grouping
+    expected = data.groupby(data['Date'].dt.to_period('M'))['Daily PNL'].sum().reset_index()
+    assert list(monthwise.columns) == ['Month', 'Daily PNL']
+    assert list(monthwise['Month']) == ["2023-01", "2023-02", "2023-12"]
+    assert list(monthwise['Month']) == list(expected['Date'].astype(str))
+    assert list(monthwise['Daily PNL']) == [3.5, -4.0, 3.0]
+
+
+def test_monthwise_pnl_without_rows():
+    monthwise = metrics.monthwise_pnl(metrics.load_and_parse(["Date", ""], []))
+
+    assert monthwise.empty
+    assert list(monthwise.columns) == ['Month', 'Daily PNL']